@@ -0,0 +1,664 @@
+import asyncio
+import logging
+import os
+import re
+from collections import OrderedDict
+from contextlib import aclosing
+from types import MappingProxyType
+from typing import Any, AsyncIterator, List, Tuple
+
+import gradio as gr
+import httpx
+import orjson
+
+logger = logging.getLogger(__name__)
+
+# モデル名の判定に使うキーワード（小文字化したモデル名を1回の走査で全て抽出する）
+_MODEL_KIND_RE = re.compile(
+    r"weblab|matsuo-lab|rinna|elyza|swallow|llama-3|llama|chat|mistral|zephyr|nous|solar|instruction|instruct"
+)
+
+# モデル種別ごとのプロンプトテンプレート（ctx: 会話履歴, msg: ユーザー入力）
+# サーバー側のプレフィックスキャッシュを効かせるため、固定の指示文を先頭に置き、
+# 会話履歴とユーザー入力などの可変部分は必ず末尾に配置すること
+
+# WebLab用の指示形式
+_TPL_WEBLAB = "以下は、タスクを説明する指示と、文脈のある入力の組み合わせです。要求を適切に満たす応答を書いてください。\n\n### 指示:\n日本語で自然な会話を行ってください。\n\n### 入力:\n{ctx}ユーザー: {msg}\n\n### 応答:\n"
+
+# Rinna指示チューニングモデル用
+_TPL_RINNA = "{ctx}ユーザー: {msg}\nアシスタント:"
+
+# ELYZA/Swallow用の指示形式
+_TPL_ELYZA = "以下は、タスクを説明する指示です。要求を適切に満たす応答を書きなさい。\n\n### 指示:\n{ctx}ユーザー: {msg}\n\n### 応答:"
+
+# Llama 3シリーズ用
+_TPL_LLAMA3 = "<|begin_of_text|><|start_header_id|>system<|end_header_id|>\n\n日本語で自然な会話を行ってください。<|eot_id|><|start_header_id|>user<|end_header_id|>\n\n{ctx}ユーザー: {msg}<|eot_id|><|start_header_id|>assistant<|end_header_id|>\n\n"
+
+# Llama 2シリーズ用
+_TPL_LLAMA2 = "<s>[INST] <<SYS>>\n日本語で自然な会話を行ってください。\n<</SYS>>\n\n{ctx}ユーザー: {msg} [/INST]"
+
+# Mistral/Zephyr用の指示形式
+_TPL_MISTRAL = "<s>[INST] <<SYS>>\n日本語で自然な会話を行ってください。\n<</SYS>>\n\n{ctx}ユーザー: {msg} [/INST]"
+
+# Nous Hermes用の指示形式
+_TPL_NOUS = "### Instruction:\n{ctx}ユーザー: {msg}\n\n### Response:"
+
+# SOLAR用の指示形式
+_TPL_SOLAR = "### User:\n{ctx}ユーザー: {msg}\n\n### Assistant:"
+
+# 一般的な指示チューニングモデル用
+_TPL_INSTRUCT = "以下は、タスクを説明する指示と、文脈のある入力の組み合わせです。要求を適切に満たす応答を書いてください。\n\n### 指示:\n日本語で自然な会話を行ってください。\n\n### 入力:\n{ctx}ユーザー: {msg}\n\n### 応答:\n"
+
+# デフォルト形式
+_TPL_DEFAULT = "{ctx}ユーザー: {msg}\nアシスタント:"
+
+_TEMPLATES = {
+    "weblab": _TPL_WEBLAB,
+    "rinna": _TPL_RINNA,
+    "elyza": _TPL_ELYZA,
+    "llama-3": _TPL_LLAMA3,
+    "llama-2": _TPL_LLAMA2,
+    "mistral": _TPL_MISTRAL,
+    "nous": _TPL_NOUS,
+    "solar": _TPL_SOLAR,
+    "instruct": _TPL_INSTRUCT,
+    "default": _TPL_DEFAULT,
+}
+
+# 会話履歴1往復分の書式
+_format_turn = "ユーザー: {}\nアシスタント: {}\n".format
+
+# 503（モデル読み込み中）・504（ゲートウェイタイムアウト）時の自動リトライ回数と1回あたりの最大待機秒数
+_RETRY_STATUS_CODES = (503, 504)
+_MAX_LOADING_RETRIES = 3
+_MAX_LOADING_WAIT = 15
+
+# 画面上に保持する会話履歴の最大往復数
+_MAX_HISTORY_TURNS = 30
+
+
+def _loading_delay(body: Any) -> float:
+    """503/504レスポンスの estimated_time から次のリトライまでの待機秒数を算出"""
+    estimated_time = body.get("estimated_time", 5) if isinstance(body, dict) else 5
+    try:
+        return min(float(estimated_time), _MAX_LOADING_WAIT)
+    except (TypeError, ValueError):
+        return 5
+
+
+def _classify_model(model_name: str) -> str:
+    """モデル名からプロンプト形式の種別を判定"""
+    found = set(_MODEL_KIND_RE.findall(model_name.lower()))
+    if found & {"weblab", "matsuo-lab"}:
+        return "weblab"
+    if "rinna" in found and "instruction" in found:
+        return "rinna"
+    if found & {"elyza", "swallow"}:
+        return "elyza"
+    if found & {"llama-3", "llama"} and found & {"chat", "instruct", "instruction"}:
+        return "llama-3" if "llama-3" in found else "llama-2"
+    if found & {"mistral", "zephyr"}:
+        return "mistral"
+    if "nous" in found:
+        return "nous"
+    if "solar" in found:
+        return "solar"
+    if found & {"instruct", "instruction"}:
+        return "instruct"
+    return "default"
+
+
+class BatchScheduler:
+    """短時間に届いた同一条件のリクエストをまとめて1回のAPI呼び出しで処理"""
+    
+    def __init__(self, client: httpx.AsyncClient, window: float = 0.05, max_batch: int = 8):
+        self._client = client
+        self._window = window
+        self._max_batch = max_batch
+        self._queue = None
+        self._worker = None
+        self._pending = set()
+    
+    async def submit(self, model: str, payload: dict) -> Tuple[int, Any]:
+        """リクエストを登録し、(ステータスコード, このプロンプトに対する結果) を待つ"""
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue()
+            self._worker = asyncio.create_task(self._run())
+        
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((model, payload, future))
+        return await future
+    
+    async def _run(self):
+        """キューを監視し、ウィンドウ内に集まったリクエストをグループ化して送信"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self._window
+            while len(batch) < self._max_batch:
+                timeout = deadline - loop.time()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), timeout))
+                except asyncio.TimeoutError:
+                    break
+            
+            # モデルと生成パラメータが一致するリクエストのみ同じバッチにまとめる
+            groups = {}
+            for model, payload, future in batch:
+                key = (model, tuple(payload["parameters"].items()))
+                groups.setdefault(key, []).append((model, payload, future))
+            
+            for items in groups.values():
+                task = asyncio.create_task(self._dispatch(items))
+                self._pending.add(task)
+                task.add_done_callback(self._pending.discard)
+    
+    async def _dispatch(self, items: list):
+        """1グループ分のリクエストを送信し、各Futureに結果を振り分け"""
+        model, payload, _ = items[0]
+        futures = [future for _, _, future in items]
+        if len(items) > 1:
+            payload = dict(payload)
+            payload["inputs"] = [p["inputs"] for _, p, _ in items]
+        
+        try:
+            response = await self._client.post(
+                model,
+                content=orjson.dumps(payload),
+                headers={"Content-Type": "application/json"}
+            )
+            if len(items) > 1 and response.status_code in (400, 422):
+                # リスト入力を受け付けないバックエンドもあるため、1件ずつ送り直す
+                # （認証エラーやレート制限などは送り直さず、そのまま全員に返す）
+                await asyncio.gather(*(self._dispatch([item]) for item in items if not item[2].done()))
+                return
+            if response.status_code != 200:
+                # エラー時は本文（503の estimated_time など）を全員に渡す
+                try:
+                    body = orjson.loads(response.content)
+                except ValueError:
+                    body = None
+                results = [body] * len(futures)
+            elif len(items) == 1:
+                results = [orjson.loads(response.content)]
+            else:
+                body = orjson.loads(response.content)
+                if not (isinstance(body, list) and len(body) == len(items)):
+                    # 入力ごとの結果が得られない場合は1件ずつ送り直す
+                    await asyncio.gather(*(self._dispatch([item]) for item in items if not item[2].done()))
+                    return
+                # 複数入力の場合は入力ごとの結果が返るため、単一入力時と同じ形式に揃える
+                results = [item if isinstance(item, list) else [item] for item in body]
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        
+        for i, future in enumerate(futures):
+            if not future.done():
+                result = results[i] if i < len(results) else None
+                future.set_result((response.status_code, result))
+
+
+class JapaneseLLMChat:
+    def __init__(self):
+        # 利用可能なLLMモデル（Inference API対応確認済み）
+        self.models = MappingProxyType({
+            # 日本語特化モデル（Inference API対応）
+            "cyberagent/open-calm-7b": "CyberAgent Open CALM 7B",
+            "rinna/japanese-gpt-neox-3.6b-instruction-sft": "Rinna GPT-NeoX 3.6B",
+            "matsuo-lab/weblab-10b-instruction-sft": "Matsuo Lab WebLab 10B",
+            "stabilityai/japanese-stablelm-instruct-alpha-7b": "Japanese StableLM 7B",
+            "tokyotech-llm/Swallow-7b-instruct-hf": "Swallow 7B Instruct (日本語対応)",
+            "elyza/ELYZA-japanese-Llama-2-7b-instruct": "ELYZA Japanese Llama 2 7B",
+            
+            # 多言語対応・英語モデル（Inference API対応）
+            "microsoft/DialoGPT-large": "DialoGPT Large (対話特化)",
+            "bigscience/bloom-7b1": "BLOOM 7B (多言語)",
+            "mistralai/Mistral-7B-Instruct-v0.2": "Mistral 7B Instruct v0.2",
+            "microsoft/DialoGPT-medium": "DialoGPT Medium (対話特化)",
+            "HuggingFaceH4/zephyr-7b-beta": "Zephyr 7B Beta (対話特化)",
+            "NousResearch/Nous-Hermes-2-Yi-34B": "Nous Hermes 2 Yi 34B",
+            "upstage/SOLAR-10.7B-Instruct-v1.0": "SOLAR 10.7B Instruct",
+            
+            # 70Bクラス（PRO/Enterprise向け）
+            "meta-llama/Meta-Llama-3.1-70B-Instruct": "Llama 3.1 70B Instruct (PRO)",
+            "meta-llama/Llama-2-70b-chat-hf": "Llama 2 70B Chat (PRO)",
+            "meta-llama/Meta-Llama-3-70B-Instruct": "Llama 3 70B Instruct (PRO)"
+        })
+        
+        # ドロップダウン用の選択肢（表示名, モデルID）を事前に作成
+        self._model_choices = tuple((v, k) for k, v in self.models.items())
+        
+        # デフォルトモデル
+        self.current_model = "cyberagent/open-calm-7b"
+        
+        # モデルごとのプロンプトテンプレートを事前に解決（str.format を保持）
+        self._prompt_builders = {
+            model_name: _TEMPLATES[_classify_model(model_name)].format for model_name in self.models
+        }
+        self._active_builder = self._prompt_builders[self.current_model]
+        
+        # 生成パラメータのテンプレート（呼び出しごとに可変項目のみ更新）
+        self._param_template = {
+            "max_length": 200,
+            "temperature": 0.7,
+            "do_sample": True,
+            "top_p": 0.95,
+            "return_full_text": False
+        }
+        
+        # 応答キャッシュ（(モデル, プロンプト, 最大長, temperature) -> 応答）
+        self._response_cache = OrderedDict()
+        self._cache_maxsize = 512
+        
+        # HuggingFace API設定
+        # INFERENCE_ENDPOINT を指定すると、自前のTGI（text-generation-inference）サーバーを利用
+        self._endpoint = os.getenv("INFERENCE_ENDPOINT")
+        self.api_url = self._endpoint or "https://api-inference.huggingface.co/models/"
+        self.headers = {}
+        
+        # 全ユーザーで共有する非同期HTTPクライアント（コネクションプール・HTTP/2）
+        # retries は接続の確立に失敗した場合のみ再試行する（503/504はquery_model・stream_model側で処理）
+        self._client = httpx.AsyncClient(
+            base_url=self.api_url,
+            transport=httpx.AsyncHTTPTransport(
+                http2=True,
+                limits=httpx.Limits(max_connections=100, max_keepalive_connections=20),
+                retries=2
+            ),
+            timeout=httpx.Timeout(30)
+        )
+        
+        # 同時に届いたリクエストをまとめて送信するマイクロバッチ処理
+        # （TGIはサーバー側で連続バッチ処理を行うため、クライアント側ではまとめない）
+        self._scheduler = BatchScheduler(self._client, max_batch=1 if self._endpoint else 8)
+        
+    def set_api_key(self, api_key: str):
+        """APIキーを設定"""
+        if api_key.strip():
+            self.headers = {"Authorization": f"Bearer {api_key}"}
+            self._client.headers["Authorization"] = self.headers["Authorization"]
+            return "✅ APIキーが設定されました"
+        else:
+            return "❌ 有効なAPIキーを入力してください"
+    
+    def set_model(self, model_name: str):
+        """使用するモデルを変更"""
+        self.current_model = model_name
+        self._active_builder = self._prompt_builders[model_name]
+        return f"モデルを {self.models[model_name]} に変更しました"
+    
+    def clear_cache(self):
+        """応答キャッシュをクリア"""
+        self._response_cache.clear()
+        return "🗑️ 応答キャッシュをクリアしました"
+    
+    def _request_path(self, stream: bool = False) -> str:
+        """リクエスト先のパスを返す（TGIの場合は /generate・/generate_stream）"""
+        if self._endpoint:
+            return "generate_stream" if stream else "generate"
+        return self.current_model
+    
+    def _build_payload(self, prompt: str, max_length: int, temperature: float) -> dict:
+        """リクエストペイロードを作成"""
+        parameters = dict(self._param_template)
+        parameters["temperature"] = temperature
+        if self._endpoint:
+            # TGIネイティブ形式
+            del parameters["max_length"]
+            parameters["max_new_tokens"] = max_length
+            return {"inputs": prompt, "parameters": parameters}
+        
+        parameters["max_length"] = max_length
+        return {
+            "inputs": prompt,
+            "parameters": parameters,
+            "options": {"use_cache": True}
+        }
+    
+    def _cache_put(self, cache_key: tuple, text: str):
+        """応答をキャッシュに保存（上限を超えたら最も古いものを削除）"""
+        self._response_cache[cache_key] = text
+        if len(self._response_cache) > self._cache_maxsize:
+            self._response_cache.popitem(last=False)
+    
+    def _finish_response(self, result: Any, use_cache: bool, cache_key: tuple) -> str:
+        """APIの結果から応答テキストを取り出し、必要に応じてキャッシュに保存"""
+        # TGIの /generate は単一のオブジェクトを返すため、リスト形式に揃える
+        if isinstance(result, dict):
+            result = [result]
+        if not (isinstance(result, list) and len(result) > 0 and isinstance(result[0], dict)):
+            return "❌ 予期しないレスポンス形式です"
+        
+        generated_text = result[0].get("generated_text") or ""
+        # 前後に空白がある場合のみ strip して不要なコピーを避ける
+        if generated_text[:1].isspace() or generated_text[-1:].isspace():
+            generated_text = generated_text.strip()
+        if not generated_text:
+            logger.warning("空の応答を受信しました (model=%s)", self.current_model)
+            return "❌ 応答が空です"
+        if use_cache:
+            self._cache_put(cache_key, generated_text)
+        return generated_text
+    
+    @staticmethod
+    def _status_message(status_code: int) -> str:
+        """エラーステータスに対応するメッセージを返す"""
+        if status_code == 503:
+            return "⏳ モデルが読み込み中です。しばらく待ってから再試行してください。"
+        elif status_code == 401:
+            return "❌ APIキーが無効です"
+        else:
+            return f"❌ エラーが発生しました (ステータス: {status_code})"
+    
+    async def query_model(self, prompt: str, max_length: int = 200, temperature: float = 0.7) -> str:
+        """HuggingFace Inference APIにクエリを送信"""
+        if not self.headers and not self._endpoint:
+            return "❌ APIキーが設定されていません"
+        
+        # temperatureが低い場合は生成がほぼ決定的なのでキャッシュを利用
+        use_cache = temperature <= 0.3
+        cache_key = (self.current_model, prompt, max_length, round(temperature, 2))
+        if use_cache and cache_key in self._response_cache:
+            self._response_cache.move_to_end(cache_key)
+            return self._response_cache[cache_key]
+        
+        payload = self._build_payload(prompt, max_length, temperature)
+        
+        try:
+            # モデル読み込み中（503）やゲートウェイタイムアウト（504）の間は待機して自動で再試行
+            for attempt in range(_MAX_LOADING_RETRIES + 1):
+                status_code, result = await self._scheduler.submit(self._request_path(), payload)
+                if status_code not in _RETRY_STATUS_CODES or attempt == _MAX_LOADING_RETRIES:
+                    break
+                await asyncio.sleep(_loading_delay(result))
+            
+            if status_code == 200:
+                return self._finish_response(result, use_cache, cache_key)
+            else:
+                return self._status_message(status_code)
+                
+        except httpx.TimeoutException:
+            return "⏳ リクエストがタイムアウトしました。再試行してください。"
+        except httpx.HTTPError as e:
+            return f"❌ 接続エラー: {str(e)}"
+        except ValueError as e:
+            # JSONとして解釈できない応答（ゲートウェイのエラーページなど）
+            return f"❌ エラーが発生しました ({str(e)})"
+    
+    async def _read_stream(self, response: httpx.Response, use_cache: bool,
+                           cache_key: tuple) -> AsyncIterator[str]:
+        """ストリーミングレスポンスを読み取り、途中までの応答を返す"""
+        # ストリーミング非対応のバックエンドは通常のJSONレスポンスとして処理
+        if "text/event-stream" not in response.headers.get("content-type", ""):
+            result = orjson.loads(await response.aread())
+            yield self._finish_response(result, use_cache, cache_key)
+            return
+        
+        # SSE形式（data: {...}）のイベントからトークンを取り出して連結
+        generated_text = ""
+        async for line in response.aiter_lines():
+            if not line.startswith("data:"):
+                continue
+            data = line[5:].strip()
+            if not data or data == "[DONE]":
+                continue
+            event = orjson.loads(data)
+            if event.get("error"):
+                yield f"❌ エラーが発生しました ({event['error']})"
+                return
+            token = event.get("token") or {}
+            if token.get("special"):
+                continue
+            generated_text += token.get("text", "")
+            yield generated_text
+        
+        yield self._finish_response([{"generated_text": generated_text}], use_cache, cache_key)
+    
+    async def stream_model(self, prompt: str, max_length: int = 200,
+                           temperature: float = 0.7) -> AsyncIterator[str]:
+        """HuggingFace Inference APIからトークンを逐次受信し、途中までの応答を返す"""
+        if not self.headers and not self._endpoint:
+            yield "❌ APIキーが設定されていません"
+            return
+        
+        use_cache = temperature <= 0.3
+        cache_key = (self.current_model, prompt, max_length, round(temperature, 2))
+        if use_cache and cache_key in self._response_cache:
+            self._response_cache.move_to_end(cache_key)
+            yield self._response_cache[cache_key]
+            return
+        
+        payload = self._build_payload(prompt, max_length, temperature)
+        if not self._endpoint:
+            payload["stream"] = True
+        
+        for attempt in range(_MAX_LOADING_RETRIES + 1):
+            try:
+                # 共有クライアントのコネクションプールを使い、レスポンスは async with で都度解放
+                async with self._client.stream(
+                    "POST",
+                    self._request_path(stream=True),
+                    content=orjson.dumps(payload),
+                    headers={"Content-Type": "application/json"}
+                ) as response:
+                    if response.status_code == 200:
+                        async for partial in self._read_stream(response, use_cache, cache_key):
+                            yield partial
+                        return
+                    
+                    body = await response.aread()
+                    if response.status_code not in _RETRY_STATUS_CODES or attempt == _MAX_LOADING_RETRIES:
+                        yield self._status_message(response.status_code)
+                        return
+                    
+                    # 待機状況を表示してから再試行
+                    try:
+                        delay = _loading_delay(orjson.loads(body))
+                    except ValueError:
+                        delay = _loading_delay(None)
+                    if response.status_code == 503:
+                        yield f"⏳ モデル起動中 (残り ~{delay:.0f}s)..."
+                    else:
+                        yield f"⏳ サーバーが応答しません。再試行します (~{delay:.0f}s)..."
+                    
+            except httpx.TimeoutException:
+                yield "⏳ リクエストがタイムアウトしました。再試行してください。"
+                return
+            except httpx.HTTPError as e:
+                yield f"❌ 接続エラー: {str(e)}"
+                return
+            except ValueError as e:
+                yield f"❌ エラーが発生しました ({str(e)})"
+                return
+            
+            await asyncio.sleep(delay)
+    
+    async def chat_response(self, message: str, history: List[Tuple[str, str]], 
+                     max_length: int, temperature: float,
+                     stream: bool = True) -> AsyncIterator[Tuple[str, List[Tuple[str, str]]]]:
+        """チャット応答を生成（ストリーミング時は途中経過を逐次返す）"""
+        if not message.strip():
+            yield "", history
+            return
+        
+        # 対話履歴を考慮したプロンプト作成
+        # 直近3回の会話を含め、最新以外の応答は先頭の1文（または80文字）に圧縮する
+        recent = history[-3:]
+        parts = []
+        for i, (user_msg, bot_msg) in enumerate(recent):
+            if i < len(recent) - 1:
+                bot_msg = (bot_msg.split("。")[0] + "。") if "。" in bot_msg else bot_msg[:80]
+            parts.append(_format_turn(user_msg, bot_msg))
+        conversation_context = "".join(parts)
+        
+        # プロンプトの構築（モデルごとに事前計算したテンプレートを使用）
+        prompt = self._active_builder(ctx=conversation_context, msg=message)
+        
+        # セッション状態の肥大化を防ぐため、今回の応答を含めて直近の会話のみ保持
+        history = history[-(_MAX_HISTORY_TURNS - 1):]
+        
+        if stream:
+            # 受信したトークンを逐次履歴に反映
+            history.append((message, ""))
+            async with aclosing(self.stream_model(prompt, max_length, temperature)) as partials:
+                async for partial in partials:
+                    history[-1] = (message, partial)
+                    yield "", history
+        else:
+            # モデルから応答を取得
+            response = await self.query_model(prompt, max_length, temperature)
+            
+            # 履歴に追加
+            history.append((message, response))
+            
+            yield "", history
+
+# チャットインスタンスを作成
+chat_bot = JapaneseLLMChat()
+
+# Gradio インターフェースの構築
+def create_interface():
+    with gr.Blocks(
+        title="日本語LLMチャット",
+        theme=gr.themes.Soft(),
+        css="""
+        .gradio-container {
+            max-width: 1000px !important;
+        }
+        """
+    ) as demo:
+        
+        gr.Markdown(
+            """
+            # 🤖 日本語LLMチャット
+            HuggingFace Inference APIを使用した日本語対話システム
+            """
+        )
+        
+        with gr.Row():
+            with gr.Column(scale=2):
+                # APIキー設定
+                with gr.Group():
+                    gr.Markdown("### 🔑 設定")
+                    api_key_input = gr.Textbox(
+                        label="HuggingFace API Token",
+                        placeholder="hf_xxxxxxxxxxxxxxxxx",
+                        type="password"
+                    )
+                    api_key_btn = gr.Button("APIキーを設定", variant="primary")
+                    api_key_status = gr.Textbox(label="ステータス", interactive=False)
+                
+                # モデル選択
+                with gr.Group():
+                    gr.Markdown("### 🧠 モデル選択")
+                    model_dropdown = gr.Dropdown(
+                        choices=chat_bot._model_choices,
+                        value="cyberagent/open-calm-7b",
+                        label="使用するモデル"
+                    )
+                    model_status = gr.Textbox(label="現在のモデル", interactive=False, 
+                                            value=chat_bot.models[chat_bot.current_model])
+                
+                # パラメータ設定
+                with gr.Group():
+                    gr.Markdown("### ⚙️ 生成パラメータ")
+                    max_length_slider = gr.Slider(
+                        minimum=50, maximum=500, value=200,
+                        label="最大生成長"
+                    )
+                    temperature_slider = gr.Slider(
+                        minimum=0.1, maximum=2.0, value=0.7,
+                        label="Temperature（創造性）"
+                    )
+                    stream_checkbox = gr.Checkbox(
+                        value=True,
+                        label="ストリーミング表示（オフにすると同時リクエストをまとめて送信）"
+                    )
+            
+            with gr.Column(scale=3):
+                # チャットインターフェース
+                chatbot = gr.Chatbot(
+                    height=500,
+                    label="会話",
+                    show_label=True,
+                    avatar_images=["👤", "🤖"]
+                )
+                
+                msg = gr.Textbox(
+                    label="メッセージ",
+                    placeholder="メッセージを入力してください...",
+                    lines=2
+                )
+                
+                with gr.Row():
+                    send_btn = gr.Button("送信", variant="primary")
+                    clear_btn = gr.Button("会話をクリア", variant="secondary")
+                    clear_cache_btn = gr.Button("キャッシュをクリア", variant="secondary")
+                
+                cache_status = gr.Textbox(label="キャッシュ", interactive=False)
+        
+        # 使用方法の説明
+        with gr.Accordion("📖 使用方法", open=False):
+            gr.Markdown(
+                """
+                1. **APIキーの設定**: HuggingFace（https://huggingface.co/settings/tokens）からAccess Tokenを取得し、上記フィールドに入力してください
+                2. **モデル選択**: 使用したい日本語LLMを選択してください
+                3. **パラメータ調整**: 必要に応じて生成パラメータを調整してください
+                4. **チャット開始**: メッセージを入力して「送信」ボタンをクリックしてください
+                
+                **注意**: 
+                - 初回使用時はモデルの読み込みに時間がかかる場合があります
+                - 70Bクラスのモデル（PRO表示）は HuggingFace PRO アカウントが必要です
+                - Inference API非対応のモデル（Sarashina2-70B等）は含まれていません
+                - リストされたモデルはInference API対応を確認済みです
+                - 70Bモデルは高いレート制限とコストがかかる場合があります
+                """
+            )
+        
+        # イベントハンドラーの設定
+        api_key_btn.click(
+            chat_bot.set_api_key,
+            inputs=[api_key_input],
+            outputs=[api_key_status]
+        )
+        
+        model_dropdown.change(
+            chat_bot.set_model,
+            inputs=[model_dropdown],
+            outputs=[model_status]
+        )
+        
+        send_btn.click(
+            chat_bot.chat_response,
+            inputs=[msg, chatbot, max_length_slider, temperature_slider, stream_checkbox],
+            outputs=[msg, chatbot],
+            concurrency_id="hf_api"
+        )
+        
+        msg.submit(
+            chat_bot.chat_response,
+            inputs=[msg, chatbot, max_length_slider, temperature_slider, stream_checkbox],
+            outputs=[msg, chatbot],
+            concurrency_id="hf_api"
+        )
+        
+        clear_btn.click(
+            lambda: ([], ""),
+            outputs=[chatbot, msg]
+        )
+        
+        clear_cache_btn.click(
+            chat_bot.clear_cache,
+            outputs=[cache_status]
+        )
+    
+    # API呼び出しはI/O待ちが中心のため、複数ユーザーのリクエストを同時に処理する
+    # （送信イベントは concurrency_id を共有し、同時実行数の上限をまとめて適用）
+    demo.queue(default_concurrency_limit=8, max_size=64)
+    
+    return demo
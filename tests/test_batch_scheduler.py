@@ -0,0 +1,147 @@
+import asyncio
+import json
+
+import httpx
+
+from chat_core import BatchScheduler
+
+PARAMS = {"max_length": 200, "temperature": 0.7}
+
+
+def make_scheduler(handler, calls):
+    def record(request):
+        calls.append(json.loads(request.content))
+        return handler(request)
+
+    client = httpx.AsyncClient(base_url="https://example.com/models/", transport=httpx.MockTransport(record))
+    return BatchScheduler(client)
+
+
+def make_items(prompts):
+    loop = asyncio.get_running_loop()
+    return [("model", {"inputs": p, "parameters": PARAMS}, loop.create_future()) for p in prompts]
+
+
+def test_batched_results_are_sliced_per_future():
+    calls = []
+
+    def handler(request):
+        inputs = json.loads(request.content)["inputs"]
+        # 入力ごとの結果は dict / list のどちらでも返り得る
+        return httpx.Response(200, json=[[{"generated_text": inputs[0]}], {"generated_text": inputs[1]}])
+
+    async def run():
+        scheduler = make_scheduler(handler, calls)
+        items = make_items(["a", "b"])
+        await scheduler._dispatch(items)
+        return [future.result() for _, _, future in items]
+
+    assert asyncio.run(run()) == [(200, [{"generated_text": "a"}]), (200, [{"generated_text": "b"}])]
+    assert calls[0]["inputs"] == ["a", "b"]
+
+
+def test_concurrent_submits_share_one_request():
+    calls = []
+
+    def handler(request):
+        inputs = json.loads(request.content)["inputs"]
+        return httpx.Response(200, json=[[{"generated_text": p}] for p in inputs])
+
+    async def run():
+        scheduler = make_scheduler(handler, calls)
+        payloads = [{"inputs": p, "parameters": PARAMS} for p in ("a", "b", "c")]
+        return await asyncio.gather(*(scheduler.submit("model", p) for p in payloads))
+
+    results = asyncio.run(run())
+    assert [r[1][0]["generated_text"] for r in results] == ["a", "b", "c"]
+    assert len(calls) == 1
+
+
+def test_error_body_is_fanned_out_to_every_future():
+    calls = []
+
+    def handler(request):
+        return httpx.Response(503, json={"error": "loading", "estimated_time": 20})
+
+    async def run():
+        scheduler = make_scheduler(handler, calls)
+        items = make_items(["a", "b"])
+        await scheduler._dispatch(items)
+        return [future.result() for _, _, future in items]
+
+    body = {"error": "loading", "estimated_time": 20}
+    assert asyncio.run(run()) == [(503, body), (503, body)]
+    assert len(calls) == 1
+
+
+def test_rejected_batch_is_resent_per_prompt():
+    calls = []
+
+    def handler(request):
+        inputs = json.loads(request.content)["inputs"]
+        if isinstance(inputs, list):
+            return httpx.Response(422, json={"error": "inputs must be a string"})
+        return httpx.Response(200, json=[{"generated_text": inputs}])
+
+    async def run():
+        scheduler = make_scheduler(handler, calls)
+        items = make_items(["a", "b"])
+        await scheduler._dispatch(items)
+        return [future.result() for _, _, future in items]
+
+    assert asyncio.run(run()) == [(200, [{"generated_text": "a"}]), (200, [{"generated_text": "b"}])]
+    assert [c["inputs"] for c in calls] == [["a", "b"], "a", "b"]
+
+
+def test_cancelled_futures_are_skipped():
+    calls = []
+
+    def handler(request):
+        inputs = json.loads(request.content)["inputs"]
+        return httpx.Response(200, json=[[{"generated_text": p}] for p in inputs])
+
+    async def run():
+        scheduler = make_scheduler(handler, calls)
+        items = make_items(["a", "b"])
+        items[0][2].cancel()
+        await scheduler._dispatch(items)
+        return [future for _, _, future in items]
+
+    cancelled, remaining = asyncio.run(run())
+    assert cancelled.cancelled()
+    assert remaining.result() == (200, [{"generated_text": "b"}])
+
+
+def test_other_client_errors_are_not_resent():
+    calls = []
+
+    def handler(request):
+        return httpx.Response(429, json={"error": "rate limited"})
+
+    async def run():
+        scheduler = make_scheduler(handler, calls)
+        items = make_items(["a", "b", "c"])
+        await scheduler._dispatch(items)
+        return [future.result()[0] for _, _, future in items]
+
+    assert asyncio.run(run()) == [429, 429, 429]
+    assert len(calls) == 1
+
+
+def test_unexpected_batch_body_is_resent_per_prompt():
+    calls = []
+
+    def handler(request):
+        inputs = json.loads(request.content)["inputs"]
+        if isinstance(inputs, list):
+            return httpx.Response(200, json={"error": "unexpected"})
+        return httpx.Response(200, json=[{"generated_text": inputs}])
+
+    async def run():
+        scheduler = make_scheduler(handler, calls)
+        items = make_items(["a", "b"])
+        await scheduler._dispatch(items)
+        return [future.result() for _, _, future in items]
+
+    assert asyncio.run(run()) == [(200, [{"generated_text": "a"}]), (200, [{"generated_text": "b"}])]
+    assert [c["inputs"] for c in calls] == [["a", "b"], "a", "b"]
@@ -0,0 +1,68 @@
+import asyncio
+import json
+
+import httpx
+
+from chat_core import BatchScheduler, JapaneseLLMChat
+
+
+def make_chat(handler):
+    chat = JapaneseLLMChat()
+    chat.set_api_key("hf_test")
+    chat._client = httpx.AsyncClient(base_url=chat.api_url, transport=httpx.MockTransport(handler))
+    chat._scheduler = BatchScheduler(chat._client)
+    return chat
+
+
+def collect(chat, prompt="こんにちは"):
+    async def run():
+        return [partial async for partial in chat.stream_model(prompt)]
+
+    return asyncio.run(run())
+
+
+def sse(*events):
+    body = "".join(f"data: {json.dumps(event)}\n\n" for event in events)
+    return httpx.Response(200, content=body.encode(), headers={"content-type": "text/event-stream"})
+
+
+def test_sse_tokens_are_accumulated():
+    def handler(request):
+        assert json.loads(request.content)["stream"] is True
+        return sse(
+            {"token": {"text": " こん", "special": False}},
+            {"token": {"text": "にちは", "special": False}},
+            {"token": {"text": "</s>", "special": True}},
+        )
+
+    assert collect(make_chat(handler)) == [" こん", " こんにちは", "こんにちは"]
+
+
+def test_non_stream_json_reply_falls_back():
+    def handler(request):
+        return httpx.Response(200, json=[{"generated_text": "こんにちは"}])
+
+    assert collect(make_chat(handler)) == ["こんにちは"]
+
+
+def test_query_model_reports_non_json_reply():
+    def handler(request):
+        return httpx.Response(200, content=b"<html>bad gateway</html>")
+
+    chat = make_chat(handler)
+    assert asyncio.run(chat.query_model("こんにちは")).startswith("❌ エラーが発生しました")
+
+
+def test_gateway_timeout_is_retried():
+    calls = []
+
+    def handler(request):
+        calls.append(request)
+        if len(calls) % 2:
+            return httpx.Response(504, json={"estimated_time": 0.01})
+        return httpx.Response(200, json=[{"generated_text": "こんにちは"}])
+
+    chat = make_chat(handler)
+    assert asyncio.run(chat.query_model("こんにちは")) == "こんにちは"
+    assert collect(chat, "こんばんは")[-1] == "こんにちは"
+    assert len(calls) == 4